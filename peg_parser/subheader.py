@@ -4,7 +4,7 @@ import ast
 import enum
 import sys
 from collections.abc import Callable
-from typing import TYPE_CHECKING, Any, ClassVar, Literal, NoReturn, TypeVar, cast
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, NoReturn, TypeVar
 
 from peg_parser.tokenize import Token, TokenInfo, generate_tokens
 from peg_parser.tokenizer import Mark, Tokenizer
@@ -19,9 +19,18 @@ if TYPE_CHECKING:
 Load = ast.Load()
 Store = ast.Store()
 Del = ast.Del()
+_ADD = ast.Add()
 
 Node = TypeVar("Node", bound=ast.AST)
 
+# the running interpreter decides how some error locations are reported
+PY311 = sys.version_info >= (3, 11)
+PY312 = sys.version_info >= (3, 12)
+
+# token lookups done on every terminal match, resolved once
+NAME = Token.NAME
+TOKEN_TYPES: dict[str, Token] = dict(Token.__members__)
+
 EXPR_NAME_MAPPING = {
     ast.Attribute: "attribute",
     ast.Subscript: "subscript",
@@ -55,84 +64,100 @@ P = TypeVar("P", bound="Parser")
 F = TypeVar("F", bound=Callable[..., Any])
 
 
+#: names of the rules marked with `logger`, traced by `trace_logged` when parsing verbosely
+LOGGED_RULES: set[str] = set()
+
+
 def logger(method: F) -> F:
     """For non-memoized functions that we want to be logged.
 
     (In practice this is only non-leader left-recursive functions.)
+    The method is returned as is, verbose parsers wrap it per instance with `trace_logged`.
     """
-    method_name = method.__name__
+    LOGGED_RULES.add(method.__name__)
+    return method
+
 
-    def logger_wrapper(self: P, *args: object) -> Any:
-        if not self._verbose:
-            return method(self, *args)
+def trace_logged(parser: Parser, method_name: str) -> Callable[..., Any]:
+    """Log the calls of a rule marked with `logger`."""
+    method = getattr(parser, method_name)
+
+    def logger_wrapper(*args: object) -> Any:
         argsr = ",".join(repr(arg) for arg in args)
-        fill = "  " * self._level
-        print(f"{fill}{method_name}({argsr}) .... (looking at {self.showpeek()})")
-        self._level += 1
-        tree = method(self, *args)
-        self._level -= 1
+        fill = "  " * parser._level
+        print(f"{fill}{method_name}({argsr}) .... (looking at {parser.showpeek()})")
+        parser._level += 1
+        tree = method(*args)
+        parser._level -= 1
         print(f"{fill}... {method_name}({argsr}) --> {tree!s:.200}")
         return tree
 
     logger_wrapper.__wrapped__ = method  # type: ignore
-    return cast(F, logger_wrapper)
+    return logger_wrapper
 
 
-def memoize(method: F) -> F:
-    """Memoize a symbol method."""
-    method_name = method.__name__
+#: dense integer ids of the memoized rules. Combined with the token position they
+#: form the index into the flat packrat cache (see `Parser._cache`).
+RULE_IDS: dict[str, int] = {}
 
-    def memoize_wrapper(self: P, *args: str | Token) -> Any:
-        mark = self._mark()
-        key = mark, method_name, args
-        # Fast path: cache hit, and not verbose.
-        if key in self._cache and not self._verbose:
-            tree, endmark = self._cache[key]
-            self._reset(endmark)
-            return tree
-        # Slow path: no cache hit, or verbose.
-        verbose, argsr, fill = self._verbose, "", ""
-        if verbose:
-            argsr = ",".join(repr(arg) for arg in args)
-            fill = "  " * self._level
-        if key not in self._cache:
-            if verbose:
-                print(f"{fill}{method_name}({argsr}) ... (looking at {self.showpeek()})")
-                self._level += 1
-            tree = method(self, *args)
-            if verbose:
-                self._level -= 1
-                print(f"{fill}... {method_name}({argsr}) -> {tree!s:.200}")
-            endmark = self._mark()
-            self._cache[key] = tree, endmark
-        else:
-            tree, endmark = self._cache[key]
-            if verbose:
-                print(f"{fill}{method_name}({argsr}) -> {tree!s:.200}")
-            self._reset(endmark)
+
+def rule_id(method_name: str) -> int:
+    return RULE_IDS.setdefault(method_name, len(RULE_IDS))
+
+
+#: the mypyc build compiles this module to an extension. Its native classes have no
+#: instance ``__dict__`` to install the `trace_memoized`/`trace_logged` wrappers in.
+COMPILED = not __file__.endswith(".py")
+
+
+def trace_memoized(parser: Parser, method_name: str) -> Callable[[], Any]:
+    """Log the calls of a memoized rule, including the cache hits.
+
+    The generated rules inline their cache lookup, so they are wrapped only when parsing verbosely,
+    and not at all in the compiled build.
+    """
+    method = getattr(parser, method_name)
+    rid = rule_id(method_name)
+
+    def memoize_trace_wrapper() -> Any:
+        key = parser._tokenizer._index * parser._nrules + rid
+        cache = parser._cache
+        fill = "  " * parser._level
+        if key < len(cache) and (hit := cache[key]) is not None:
+            print(f"{fill}{method_name}() -> {hit[0]!s:.200}")
+            return method()
+        print(f"{fill}{method_name}() ... (looking at {parser.showpeek()})")
+        parser._level += 1
+        tree = method()
+        parser._level -= 1
+        print(f"{fill}... {method_name}() -> {tree!s:.200}")
         return tree
 
-    memoize_wrapper.__wrapped__ = method  # type: ignore
-    return cast(F, memoize_wrapper)
+    memoize_trace_wrapper.__wrapped__ = method  # type: ignore
+    return memoize_trace_wrapper
 
 
 def memoize_left_rec(method: Callable[[P], T | None]) -> Callable[[P], T | None]:
     """Memoize a left-recursive symbol method."""
     method_name = method.__name__
+    rid = rule_id(method_name)
 
     def memoize_left_rec_wrapper(self: P) -> T | Any | None:
-        mark = self._mark()
-        key = mark, method_name, ()
+        mark = self._tokenizer._index
+        key = mark * self._nrules + rid
+        cache = self._cache
+        if key >= len(cache):  # grow the table as the tokenizer moves forward
+            cache.extend([None] * (key + 1))
         # Fast path: cache hit, and not verbose.
-        if key in self._cache and not self._verbose:
-            tree, endmark = self._cache[key]
-            self._reset(endmark)
+        if (hit := cache[key]) is not None and not self._verbose:
+            tree, endmark = hit
+            self._tokenizer._index = endmark
             return tree
         # Slow path: no cache hit, or verbose.
         verbose, fill = self._verbose, ""
         if verbose:
             fill = "  " * self._level
-        if key not in self._cache:
+        if hit is None:
             if verbose:
                 print(f"{fill}{method_name} ... (looking at {self.showpeek()})")
                 self._level += 1
@@ -146,7 +171,7 @@ def memoize_left_rec(method: Callable[[P], T | None]) -> Callable[[P], T | None]
             # (http://web.cs.ucla.edu/~todd/research/pub.php?id=pepm08).
 
             # Prime the cache with a failure.
-            self._cache[key] = None, mark
+            cache[key] = None, mark
             lastresult: Any = None
             lastmark = mark
             depth = 0
@@ -154,13 +179,13 @@ def memoize_left_rec(method: Callable[[P], T | None]) -> Callable[[P], T | None]
                 print(f"{fill}Recursive {method_name} at {mark} depth {depth}")
 
             while True:
-                self._reset(mark)
+                self._tokenizer._index = mark
                 self.in_recursive_rule += 1
                 try:
                     result = method(self)
                 finally:
                     self.in_recursive_rule -= 1
-                endmark = self._mark()
+                endmark = self._tokenizer._index
                 depth += 1
                 if verbose:
                     print(
@@ -174,26 +199,26 @@ def memoize_left_rec(method: Callable[[P], T | None]) -> Callable[[P], T | None]
                     if verbose:
                         print(f"{fill}Bailing with {lastresult!s:.200} to {lastmark}")
                     break
-                self._cache[key] = lastresult, lastmark = result, endmark
+                cache[key] = lastresult, lastmark = result, endmark
 
-            self._reset(lastmark)
+            self._tokenizer._index = lastmark
             tree = lastresult
 
             if verbose:
                 self._level -= 1
                 print(f"{fill}{method_name}() -> {tree!s:.200} [cached]")
             if tree:
-                endmark = self._mark()
+                endmark = self._tokenizer._index
             else:
                 endmark = mark
-                self._reset(endmark)
-            self._cache[key] = tree, endmark
+                self._tokenizer._index = endmark
+            cache[key] = tree, endmark
         else:
-            tree, endmark = self._cache[key]
+            tree, endmark = hit
             if verbose:
                 print(f"{fill}{method_name}() -> {tree!s:.200} [fresh]")
             if tree:
-                self._reset(endmark)
+                self._tokenizer._index = endmark
         return tree
 
     memoize_left_rec_wrapper.__wrapped__ = method  # type: ignore
@@ -219,12 +244,24 @@ def xonsh_call(name: str, *args: Node, **locs: int) -> ast.Call:
         func=load_attribute_chain(name, **locs),
         args=list(args),
         keywords=[],
-        starargs=None,
-        kwargs=None,
         **locs,
     )
 
 
+def node_start(node: ast.AST | TokenInfo) -> tuple[int, int]:
+    """(line, column) where the token or AST node starts"""
+    if isinstance(node, TokenInfo):
+        return node.start
+    return node.lineno, node.col_offset
+
+
+def node_end(node: ast.AST | TokenInfo) -> tuple[int, int]:
+    """(line, column) where the token or AST node ends"""
+    if isinstance(node, TokenInfo):
+        return node.end
+    return node.end_lineno or 0, node.end_col_offset or 0
+
+
 class Target(enum.Enum):
     FOR_TARGETS = enum.auto()
     STAR_TARGETS = enum.auto()
@@ -232,8 +269,8 @@ class Target(enum.Enum):
 
 
 class Parser:
-    KEYWORDS: ClassVar[tuple[str, ...]]
-    SOFT_KEYWORDS: ClassVar[tuple[str, ...]]
+    KEYWORDS: ClassVar[frozenset[str]]
+    SOFT_KEYWORDS: ClassVar[frozenset[str]]
 
     #: Name of the source file, used in error reports
     filename: str
@@ -249,7 +286,10 @@ class Parser:
         self._tokenizer = tokenizer
         self._verbose = verbose
         self._level = 0
-        self._cache: dict[tuple[Mark, str, tuple[Any, ...]], tuple[Any, Mark]] = {}
+        # packrat cache as a flat table indexed by `mark * _nrules + rule_id`.
+        # Unvisited slots are None, otherwise they hold the `(tree, endmark)` of the rule.
+        self._cache: list[tuple[Any, Mark] | None] = []
+        self._nrules = len(RULE_IDS)
 
         # Integer tracking wether we are in a left recursive rule or not. Can be useful
         # for error reporting.
@@ -258,9 +298,18 @@ class Parser:
         # handle path literal joined-str
         self._path_token: TokenInfo | None = None
 
-        # Pass through common tokenizer methods.
+        # Pass through common tokenizer methods. The hot paths read and write
+        # `self._tokenizer._index` directly instead.
         self._mark = self._tokenizer.mark
         self._reset = self._tokenizer.reset
+        if verbose and not COMPILED:
+            # the rules with an inlined cache lookup (see `trace_memoized`)
+            for name in RULE_IDS:
+                if hasattr(type(self), f"_{name}_id"):
+                    setattr(self, name, trace_memoized(self, name))
+            for name in LOGGED_RULES:
+                if hasattr(type(self), name):
+                    setattr(self, name, trace_logged(self, name))
 
         # Are we looking for syntax error ? When true enable matching on invalid rules
         self.call_invalid_rules = False
@@ -274,19 +323,19 @@ class Parser:
 
     def name(self) -> TokenInfo | None:
         tok = self._tokenizer.peek()
-        if tok.type == Token.NAME and tok.string not in self.KEYWORDS:
+        if tok.type is NAME and tok.string not in self.KEYWORDS:
             return self._tokenizer.getnext()
         return None
 
     def keyword(self) -> TokenInfo | None:
         tok = self._tokenizer.peek()
-        if tok.type == Token.NAME and tok.string in self.KEYWORDS:
+        if tok.type is NAME and tok.string in self.KEYWORDS:
             return self._tokenizer.getnext()
         return None
 
     def token(self, typ: str) -> TokenInfo | None:
         tok = self._tokenizer.peek()
-        if tok.type == Token[typ]:
+        if tok.type is TOKEN_TYPES[typ]:
             return self._tokenizer.getnext()
         return None
 
@@ -295,7 +344,7 @@ class Parser:
 
     def soft_keyword(self) -> TokenInfo | None:
         tok = self._tokenizer.peek()
-        if tok.type == Token.NAME and tok.string in self.SOFT_KEYWORDS:
+        if tok.type is NAME and tok.string in self.SOFT_KEYWORDS:
             return self._tokenizer.getnext()
         return None
 
@@ -306,70 +355,51 @@ class Parser:
         return None
 
     def repeated(self, func: Callable[..., T | None], *args: Any) -> list[T]:
-        mark = self._mark()
+        mark = self._tokenizer._index
         children = []
         while result := func(*args):
             children.append(result)
-            mark = self._mark()
-        self._reset(mark)
+            mark = self._tokenizer._index
+        self._tokenizer._index = mark
         return children
 
-    def sep_repeated(
-        self,
-        func: Callable[..., T | None] | tuple[Callable[..., T | None], ...],
-        sep_func: Callable[..., Any],
-        *sep_args: Any,
-    ) -> Any:
-        if (sep_func(*sep_args)) and (elem := self.seq_alts(func)):
-            return elem
-        return None
-
     def gathered(
         self,
-        func: Callable[..., T | None] | tuple[Callable[..., T | None], ...],
+        func: Callable[[], T | None],
         sep: Callable[..., Any],
         *sep_args: Any,
     ) -> list[T] | None:
         # gather: ','.e+
-        seq: list[T]
-        mark = self._mark()
-        if (elem := self.seq_alts(func)) is not None and (
-            seq := self.repeated(self.sep_repeated, func, sep, *sep_args)
-        ) is not None:
-            return [elem, *seq]
-        self._reset(mark)
-        return None
+        tokenizer = self._tokenizer
+        mark = tokenizer._index
+        if not (elem := func()):
+            tokenizer._index = mark
+            return None
+        children = [elem]
+        mark = tokenizer._index
+        # the separator is only consumed together with the element that follows it
+        while sep(*sep_args) and (elem := func()):
+            children.append(elem)
+            mark = tokenizer._index
+        tokenizer._index = mark
+        return children
 
     def positive_lookahead(self, func: Callable[..., T], *args: object) -> T:
-        mark = self._mark()
+        mark = self._tokenizer._index
         ok = func(*args)
-        self._reset(mark)
+        self._tokenizer._index = mark
         return ok
 
     def negative_lookahead(self, func: Callable[..., object], *args: object) -> bool:
-        mark = self._mark()
+        mark = self._tokenizer._index
         ok = func(*args)
-        self._reset(mark)
+        self._tokenizer._index = mark
         return not ok
 
     def span(self, lnum: int, col: int) -> dict[str, int]:
         end = self._tokenizer.get_last_non_whitespace_token().end
         return {"lineno": lnum, "col_offset": col, "end_lineno": end[0], "end_col_offset": end[1]}
 
-    def seq_alts(self, *alt: Callable[..., T] | tuple[Callable[..., T], ...]) -> T | None:
-        """Hanle sequence of alts that don't have action associated with them."""
-        mark = self._mark()
-        for arg in alt:
-            if isinstance(arg, tuple):
-                method, *args = arg
-                res = method(*args)
-            else:
-                res = arg()
-            if res:
-                return res
-            self._reset(mark)
-        return None
-
     def parse(self, rule: str, call_invalid_rules: bool = False) -> ast.AST | Any | None:
         self.call_invalid_rules = call_invalid_rules
         res = getattr(self, rule)()
@@ -421,12 +451,9 @@ class Parser:
             else:
                 return "literal"
 
-        try:
-            name = EXPR_NAME_MAPPING[node_t]
-        except KeyError as e:
-            raise ValueError(
-                f"unexpected expression in assignment {type(node).__name__} " f"(line {node.lineno})."
-            ) from e
+        name = EXPR_NAME_MAPPING.get(node_t)
+        if name is None:
+            raise ValueError(f"unexpected expression in assignment {node_t.__name__} (line {node.lineno}).")
         return name
 
     def get_invalid_target(self, target: Target, node: ast.AST | None) -> ast.AST | None:
@@ -488,21 +515,6 @@ class Parser:
 
         return s.encode()[0]
 
-    def _concat_strings_in_constant(self, parts: list[TokenInfo]) -> ast.Constant:
-        s = ast.literal_eval(parts[0].string)
-        for ss in parts[1:]:
-            s += ast.literal_eval(ss.string)
-        args = {
-            "value": s,
-            "lineno": parts[0].start[0],
-            "col_offset": parts[0].start[1],
-            "end_lineno": parts[-1].end[0],
-            "end_col_offset": parts[0].end[1],
-        }
-        if parts[0].string.startswith("u"):
-            args["kind"] = "u"
-        return ast.Constant(**args)
-
     def concatenate_strings(
         self, parts: list[ast.JoinedStr | TokenInfo]
     ) -> ast.Constant | ast.JoinedStr | ast.Call:
@@ -514,10 +526,9 @@ class Parser:
         if isinstance(parts[-1], ast.JoinedStr):
             end = parts[-1].end_lineno, parts[-1].end_col_offset
 
-        # Combine the different parts
+        # Combine the different parts, merging adjacent constants as we go
         seen_joined = False
         values: list[Any] = []  # ast.Constant | ast.FormattedValue
-        ss: list[TokenInfo] = []
 
         if path_tok := (self._strip_path_prefix(parts[0])):
             parts[0] = path_tok
@@ -525,31 +536,27 @@ class Parser:
         for p in parts:
             if isinstance(p, ast.JoinedStr):
                 seen_joined = True
-                if ss:
-                    values.append(self._concat_strings_in_constant(ss))
-                    ss.clear()
-
-                values.extend(p.values)
+                for v in p.values:
+                    if values and isinstance(values[-1], ast.Constant) and isinstance(v, ast.Constant):
+                        values[-1].value += v.value
+                        values[-1].end_lineno = v.end_lineno
+                        values[-1].end_col_offset = v.end_col_offset
+                    else:
+                        values.append(v)
+            elif values and isinstance(values[-1], ast.Constant):
+                values[-1].value += ast.literal_eval(p.string)
+                values[-1].end_lineno, values[-1].end_col_offset = p.end
             else:
-                ss.append(p)
-
-        if ss:
-            values.append(self._concat_strings_in_constant(ss))
-
-        consolidated: list[Any] = []  # ast.Constant | ast.FormattedValue
-        for p in values:
-            if consolidated and isinstance(consolidated[-1], ast.Constant) and isinstance(p, ast.Constant):
-                consolidated[-1].value += p.value  # type: ignore[unreachable]
-                consolidated[-1].end_lineno = p.end_lineno
-                consolidated[-1].end_col_offset = p.end_col_offset
-            else:
-                consolidated.append(p)
+                const = ast.Constant(value=ast.literal_eval(p.string), **p.loc())
+                if p.string.startswith("u"):
+                    const.kind = "u"
+                values.append(const)
 
         if not seen_joined and len(values) == 1 and isinstance(values[0], ast.Constant):
             node: ast.Constant | ast.JoinedStr | ast.Call = values[0]
         else:
             node = ast.JoinedStr(
-                values=consolidated,
+                values=values,
                 lineno=start[0] if start else values[0].lineno,
                 col_offset=start[1] if start else values[0].col_offset,
                 end_lineno=end[0] if end else values[-1].end_lineno,
@@ -574,13 +581,17 @@ class Parser:
         if not isinstance(token, TokenInfo):
             return None
         text = token.string
-        idx = text.find("'") if text.find("'") >= 0 else text.find('"')
-        if idx > 0:
-            prefix, text = text[:idx].lower(), text[idx:]
-            if "p" in prefix:
-                prefix = prefix.replace("p", "", 1)
-                return token._replace(string=prefix + text)
-        return None
+        if text[0] in "'\"":  # no prefix at all, the common case
+            return None
+        # the prefix ends at the first quote, which may be either kind
+        idx = next((i for i, char in enumerate(text) if char in "'\""), -1)
+        if idx == -1:
+            return None
+        prefix = text[:idx]
+        if "p" not in prefix and "P" not in prefix:
+            return None
+        prefix = prefix.lower().replace("p", "", 1)
+        return token._replace(string=prefix + text[idx:])
 
     def extract_import_level(self, tokens: list[TokenInfo]) -> int:
         """Extract the relative import level from the tokens preceding the module name.
@@ -653,15 +664,13 @@ class Parser:
     def expand_help(self, atoms: list[tuple[ast.Name, TokenInfo]], **_: int) -> ast.Call | None:
         node: ast.Call | None = None
         for atom, tok in atoms:
-            fn = "superhelp" if tok.is_exact_type("??") else "help"
+            # the grammar only passes '?' and '??' operator tokens here
+            fn = "__xonsh__.superhelp" if tok.string == "??" else "__xonsh__.help"
+            locs = tok.loc()
             if node is None:
-                node = xonsh_call(f"__xonsh__.{fn}", atom, **tok.loc())
+                node = xonsh_call(fn, atom, **locs)
             else:
-                node = xonsh_call(
-                    f"__xonsh__.{fn}",
-                    ast.Attribute(value=node, attr=atom.id, ctx=Load, **tok.loc()),
-                    **tok.loc(),
-                )
+                node = xonsh_call(fn, ast.Attribute(value=node, attr=atom.id, ctx=Load, **locs), **locs)
         return node
 
     def expand_env_expr(
@@ -714,7 +723,7 @@ class Parser:
             )
         return ast.BinOp(
             left=tree,
-            op=ast.Add(),
+            op=_ADD,
             right=ast.Constant(value=cmd.string, **cmd.loc()) if isinstance(cmd, TokenInfo) else cmd,
             **locs,
             end_lineno=cmd.end_lineno if isinstance(cmd, ast.AST) else cmd.end[0],
@@ -799,7 +808,7 @@ class Parser:
 
     def proc_macro_arg(self, a: list[TokenInfo | str], **locs: int) -> ast.Constant:
         locs["col_offset"] += 1  # offset `!`
-        st = "".join((tok.string if isinstance(tok, TokenInfo) else tok) for tok in a).strip()
+        st = "".join([tok.string if isinstance(tok, TokenInfo) else tok for tok in a]).strip()
         self._tokenizer._proc_macro = False
         return ast.Constant(value=st, **locs)
 
@@ -818,15 +827,13 @@ class Parser:
         if line_from_token:
             line = tok.line
         else:
-            # End is used only to get the proper text
-            line = "\\n".join(self._tokenizer.get_lines(list(range(start[0], end[0] + 1))))
+            # End is used only to get the proper text. The lines keep their line endings.
+            line = "".join(self._tokenizer.get_lines(range(start[0], end[0] + 1)))
 
         # tokenize.py index column offset from 0 while Cpython index column
         # offset at 1 when reporting SyntaxError, so we need to increment
         # the column offset when reporting the error.
-        args = (self.filename, start[0], start[1] + 1, line)
-        args += (end[0], end[1] + 1)  # type: ignore
-
+        args = (self.filename, start[0], start[1] + 1, line, end[0], end[1] + 1)
         return SyntaxError(message, args)
 
     def raise_raw_syntax_error(
@@ -844,9 +851,7 @@ class Parser:
         if res is None:
             last_token = self._tokenizer.diagnose()
             end = last_token.start
-            if sys.version_info >= (3, 12) or (
-                sys.version_info >= (3, 11) and last_token.type != Token.NEWLINE
-            ):  # i.e. not a \n
+            if PY312 or (PY311 and last_token.type != Token.NEWLINE):  # i.e. not a \n
                 end = last_token.end
             self.raise_raw_syntax_error(f"expected {expectation}", last_token.start, end)
         return res
@@ -857,19 +862,12 @@ class Parser:
         raise self._build_syntax_error(
             message,
             tok.start,
-            tok.end if sys.version_info >= (3, 12) or tok.type != Token.NEWLINE else tok.start,
+            tok.end if PY312 or tok.type != Token.NEWLINE else tok.start,
         )
 
     def raise_syntax_error_known_location(self, message: str, node: ast.AST | TokenInfo) -> NoReturn:
         """Raise a syntax error that occured at a given AST node."""
-        if isinstance(node, TokenInfo):
-            start = node.start
-            end = node.end
-        else:
-            start = node.lineno, node.col_offset
-            end = node.end_lineno or 0, node.end_col_offset or 0
-
-        raise self._build_syntax_error(message, start, end)
+        raise self._build_syntax_error(message, node_start(node), node_end(node))
 
     def raise_syntax_error_known_range(
         self,
@@ -877,27 +875,12 @@ class Parser:
         start_node: ast.AST | TokenInfo,
         end_node: ast.AST | TokenInfo,
     ) -> NoReturn:
-        if isinstance(start_node, TokenInfo):
-            start = start_node.start
-        else:
-            start = start_node.lineno, start_node.col_offset
-
-        if isinstance(end_node, TokenInfo):
-            end = end_node.end
-        else:
-            end = end_node.end_lineno or 0, end_node.end_col_offset or 0
-
-        raise self._build_syntax_error(message, start, end)
+        raise self._build_syntax_error(message, node_start(start_node), node_end(end_node))
 
     def raise_syntax_error_starting_from(self, message: str, start_node: ast.AST | TokenInfo) -> NoReturn:
-        if isinstance(start_node, TokenInfo):
-            start = start_node.start
-        else:
-            start = start_node.lineno, start_node.col_offset
-
         last_token = self._tokenizer.diagnose()
 
-        raise self._build_syntax_error(message, start, last_token.start)
+        raise self._build_syntax_error(message, node_start(start_node), last_token.start)
 
     def raise_syntax_error_invalid_target(self, target: Target, node: ast.AST | None) -> None:
         invalid_target = self.get_invalid_target(target, node)
@@ -944,9 +927,7 @@ class Parser:
         verbose: bool = False,
     ) -> Any:
         """Parse a string."""
-        import io
-
-        tok_stream = generate_tokens(io.StringIO(source).readline)
+        tok_stream = generate_tokens(source)
         tokenizer = Tokenizer(tok_stream, verbose=verbose)
         parser = cls(tokenizer, verbose=verbose, py_version=py_version)
         return parser.parse(mode if mode == "eval" else "file")
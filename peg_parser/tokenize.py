@@ -30,10 +30,10 @@ __credits__ = (
 )
 
 import dataclasses
-import functools
 import io
-import itertools as _itertools
 import re
+import string
+import sys
 from enum import Enum, auto
 from typing import TYPE_CHECKING, Any, Final, NamedTuple
 
@@ -163,9 +163,12 @@ class TokenInfo(NamedTuple):
 
     def loc(self) -> dict[str, int]:
         """helper method to construct AST node location"""
+        (lineno, col_offset), (end_lineno, end_col_offset) = self.start, self.end
         return {
-            **self.loc_start(),
-            **self.loc_end(),
+            "lineno": lineno,
+            "col_offset": col_offset,
+            "end_lineno": end_lineno,
+            "end_col_offset": end_col_offset,
         }
 
     def is_next_to(self, prev: TokenInfo) -> bool:
@@ -212,31 +215,11 @@ Imagnumber = group(r"[0-9](?:_?[0-9])*[jJ]", Floatnumber + r"[jJ]")
 Number = group(Imagnumber, Floatnumber, Intnumber)
 
 
-# Return the empty string, plus all of the valid string prefixes.
-def _all_string_prefixes() -> set[str]:
-    # The valid string prefixes. Only contain the lower case versions,
-    #  and don't contain any permutations (include 'fr', but not
-    #  'rf'). The various permutations will be generated.
-    _valid_string_prefixes = ["b", "r", "u", "f", "br", "fr", "p", "pr", "pf"]
-    # if we add binary f-strings, add: ['fb', 'fbr']
-    result = {""}
-    for prefix in _valid_string_prefixes:
-        for perm in _itertools.permutations(prefix):
-            # create a list with upper and lower versions of each
-            #  character
-            for u in _itertools.product(*[(c, c.upper()) for c in perm]):
-                result.add("".join(u))
-    return result
-
-
-@functools.lru_cache
-def _compile(expr: str) -> re.Pattern[str]:
-    return re.compile(expr, re.UNICODE)
-
-
-# Note that since _all_string_prefixes includes the empty string,
+# The valid string prefixes in any order and case ("rb", "Br", ...) are matched case-insensitively.
+#  if we add binary f-strings, add: fb, bf, fbr ...
 #  StringPrefix can be the empty string (making it optional).
-StringStart = group(*_all_string_prefixes(), name="StringPrefix") + group(
+StringPrefix = r"(?i:br|rb|fr|rf|pr|rp|pf|fp|b|r|u|f|p)?"
+StringStart = capname("StringPrefix", StringPrefix) + group(
     group("'''", '"""', name="TripleQt"), group('"', "'", name="SingleQt"), name="Quote"
 )
 
@@ -250,6 +233,17 @@ Special = group(
     )
 )
 
+
+def _special_by_first_char() -> dict[str, list[str]]:
+    """group the operators by their first character, longest first"""
+    result: dict[str, list[str]] = {}
+    for op in sorted(OPS, key=len, reverse=True):
+        result.setdefault(op[0], []).append(op)
+    return result
+
+
+SPECIAL_BY_FIRSTCHAR: Final = _special_by_first_char()
+
 SearchPath = r"([rgpf]+|@\w*)?`([^\n`\\]*(?:\\.[^\n`\\]*)*)`"
 PseudoToken = choice(
     Comment=Comment,
@@ -275,6 +269,59 @@ endpats: Final = {
 StartLBrace = r".*?(?=\{(?!\{)){"
 EndRBrace = r".*?(?=\}(?!\}))}"
 
+# the patterns are compiled once here instead of being looked up on every match
+pseudoprog: Final = re.compile(PseudoToken, re.UNICODE)
+endprogs: Final = {quote: re.compile(pattern, re.UNICODE) for quote, pattern in endpats.items()}
+# string portion of an f-string, up to the next "{" or the closing quote
+fstring_middle_progs: Final = {
+    quote: re.compile(choice(LBrace=StartLBrace, End=pattern), re.UNICODE)
+    for quote, pattern in endpats.items()
+}
+# format specifier of an f-string, up to the closing "}"
+colon_prog: Final = re.compile(choice(RBrace=EndRBrace), re.UNICODE)
+# placeholder end pattern inside f-string braces, where the end patterns are not matched
+braces_prog: Final = re.compile(r"(?!)", re.UNICODE)
+
+
+def _first_char_progs() -> dict[str, re.Pattern[str]]:
+    """map the characters that can start only one kind of PseudoToken to the pattern of that kind.
+
+    The rest (string prefixes, search path prefixes, ".", "@", non-ascii ...) go through PseudoToken.
+    """
+    branches = {
+        "Comment": (Comment, "#"),
+        "StringStart": (StringStart, "'\""),
+        "End": (r"\\\r?\n", "\\"),
+        "NL": (r"\r?\n", "\r\n"),
+        "SearchPath": (SearchPath, "`"),
+        "Number": (Number, string.digits),
+        "Name": (Name, "".join(sorted(set(string.ascii_letters + "_") - set("bBrRuUfFpPgG")))),
+        "ws": (Whitespace, " \f\t"),
+    }
+    progs = {}
+    for name, (pattern, chars) in branches.items():
+        prog = re.compile(capname(name, pattern), re.UNICODE)
+        progs.update(dict.fromkeys(chars, prog))
+    for char, ops in SPECIAL_BY_FIRSTCHAR.items():
+        if char not in ".@":
+            progs[char] = re.compile(capname("Special", "|".join(map(re.escape, ops))))
+    return progs
+
+
+# leading whitespace of a statement
+indent_prog: Final = re.compile(r"[ \f\t]*")
+
+# the tokens are matched directly by their first character, skipping the PseudoToken alternation.
+first_char_progs: Final = _first_char_progs()
+
+# PseudoToken groups that map directly to a token type
+SIMPLE_TOKEN_TYPES: Final = {
+    "ws": Token.WS,
+    "Comment": Token.COMMENT,
+    "SearchPath": Token.SEARCH_PATH,
+    "Name": Token.NAME,
+}
+
 tabsize = 8
 
 
@@ -311,6 +358,7 @@ class TokenizerState:
         self.pos = 0
         self.max = 0
         self.end_progs: list[EndProg] = []
+        self.positions: dict[int, tuple[int, int]] = {}
 
     def move_next_line(self, readline: Callable[[], str]) -> None:
         self.last_line = self.line
@@ -325,6 +373,13 @@ class TokenizerState:
         self.lnum += 1
         self.pos = 0
         self.max = len(self.line)
+        self.positions = {}
+
+    def position(self, col: int) -> tuple[int, int]:
+        """return the (lnum, col) tuple, shared between the tokens of the current line"""
+        if (pos := self.positions.get(col)) is None:
+            pos = self.positions[col] = (self.lnum, col)
+        return pos
 
     def __repr__(self) -> str:
         form = f"<TokenizerState: {self.line[:self.pos]}﹝{self.pos}﹞{self.line[self.pos:]}> "
@@ -334,7 +389,12 @@ class TokenizerState:
 
     def add_prog(self, start: int, end: int, **kwargs: Any) -> None:
         self.end_progs.append(
-            EndProg(text=self.line[start:end], contline=self.line, start=(self.lnum, start), **kwargs)
+            EndProg(
+                text_parts=[self.line[start:end]] if end > start else [],
+                contline_parts=[self.line],
+                start=(self.lnum, start),
+                **kwargs,
+            )
         )
 
     def prog_token(self, end: int, tok: Token) -> TokenInfo:
@@ -342,10 +402,10 @@ class TokenizerState:
         endprog.join(self, end)
         self.pos = end
         epos = (self.lnum, end)
-        return TokenInfo(tok, endprog.text, endprog.start, epos, endprog.contline)
+        text, contline = "".join(endprog.text_parts), "".join(endprog.contline_parts)
+        return TokenInfo(tok, text, endprog.start, epos, contline)
 
-    def match(self, pattern: str | re.Pattern[str]) -> re.Match[str] | None:
-        pattern = _compile(pattern) if isinstance(pattern, str) else pattern
+    def match(self, pattern: re.Pattern[str]) -> re.Match[str] | None:
         return pattern.match(self.line, self.pos)
 
     def in_mode(self, mode: type[Mode]) -> bool:
@@ -373,51 +433,54 @@ class TokenizerState:
         return (self.end_progs[-1].mode is not None) and self.end_progs[-1].mode.parenlevel == self.parenlev
 
     def in_continued_string(self) -> bool:
-        return (
-            bool(self.end_progs)
-            and (
-                (self.line[-2:] == "\\\n")  # single quote should have line continuation at the end
-                or (self.line[-3:] == "\\\r\n")
-            )
-        )
+        # single quote should have line continuation at the end
+        return bool(self.end_progs) and self.line.endswith(("\\\n", "\\\r\n"))
 
 
 @dataclasses.dataclass(slots=True)
 class EndProg:
     mode: Mode | None = None
-    pattern: re.Pattern[str] | str = ""  # end pattern
-    text: str = ""
-    contline: str = ""  # str
+    pattern: re.Pattern[str] = braces_prog  # end pattern
+    # pieces of the string and of its lines, joined only when the token is built.
+    # empty pieces are not added, so a non-empty list means there is some text.
+    text_parts: list[str] = dataclasses.field(default_factory=list)
+    contline_parts: list[str] = dataclasses.field(default_factory=list)
     start: tuple[int, int] = (0, 0)
     quote: str = ""
 
     def join(self, state: TokenizerState, end: int) -> None:
-        self.text += state.line[state.pos : end]
+        if end > state.pos:
+            self.text_parts.append(state.line[state.pos : end])
 
     def join_line(self, state: TokenizerState) -> None:
-        self.text += state.line[state.pos :]
-        self.contline += state.line
+        if state.max > state.pos:
+            self.text_parts.append(state.line[state.pos :])
+        self.contline_parts.append(state.line)
 
     def reset(self, start: tuple[int, int]) -> None:
         self.start = start
-        self.text = ""
-        self.contline = ""
+        self.text_parts = []
+        self.contline_parts = []
 
 
 def next_statement(state: TokenizerState) -> Generator[TokenInfo, None, bool | None]:
     if not state.line:
         return False  # break parent loop
-    column = 0
-    while state.pos < state.max:  # measure leading whitespace
-        if state.line[state.pos] == " ":
-            column += 1
-        elif state.line[state.pos] == "\t":
-            column = (column // tabsize + 1) * tabsize
-        elif state.line[state.pos] == "\f":
-            column = 0
-        else:
-            break
-        state.pos += 1
+    indent = state.match(indent_prog)  # measure leading whitespace
+    assert indent is not None  # matches the empty string too
+    whitespace = indent.group()
+    state.pos += len(whitespace)
+    if "\t" in whitespace or "\f" in whitespace:
+        column = 0
+        for char in whitespace:
+            if char == " ":
+                column += 1
+            elif char == "\t":
+                column = (column // tabsize + 1) * tabsize
+            else:  # form feed
+                column = 0
+    else:
+        column = len(whitespace)
 
     if state.pos == state.max:
         return False  # break parent loop
@@ -463,35 +526,33 @@ def next_statement(state: TokenizerState) -> Generator[TokenInfo, None, bool | N
 def next_psuedo_matches(state: TokenizerState) -> TokenInfo | None:
     if state.pos == state.max or state.in_fstring():
         return None
-    match = state.match(PseudoToken)
-    if (not match) or (not match.lastgroup):
+    prog = first_char_progs.get(state.line[state.pos], pseudoprog)
+    match = state.match(prog)
+    if (not match) or (not (kind := match.lastgroup)):
         return None
-    start, end = match.span(match.lastgroup)
-    spos, epos, state.pos = (state.lnum, start), (state.lnum, end), end
+    start, end = match.span(kind)
+    spos, epos, state.pos = state.position(start), state.position(end), end
     token = state.line[start:end]
+    if kind in ("Name", "Special"):
+        # identifiers and operators repeat a lot, share a single copy of them
+        token = sys.intern(token)
 
-    if match.lastgroup == "StringStart":
+    if tok := SIMPLE_TOKEN_TYPES.get(kind):
+        token_type = tok
+    elif kind == "StringStart":
         quote = match.group("Quote") or '"'
         if "f" in token.lower():
             token_type = Token.FSTRING_START
-            pattern = choice(LBrace=StartLBrace, End=endpats[quote])
+            pattern = fstring_middle_progs[quote]
             state.add_prog(end, end, pattern=pattern, quote=quote, mode=ModeMiddle(state.parenlev))
         else:
-            pattern = endpats[quote]
-            state.add_prog(start, end, pattern=pattern, quote=quote)
+            state.add_prog(start, end, pattern=endprogs[quote], quote=quote)
             return None
-    elif tok := {
-        "ws": Token.WS,
-        "Comment": Token.COMMENT,
-        "SearchPath": Token.SEARCH_PATH,
-        "Name": Token.NAME,
-    }.get(match.lastgroup):
-        token_type = tok
-    elif match.lastgroup == "Number" or (token[0] == "." and token not in (".", "...")):
+    elif kind == "Number" or (token[0] == "." and token not in (".", "...")):
         token_type = Token.NUMBER
-    elif match.lastgroup == "NL":
+    elif kind == "NL":
         token_type = Token.NL if state.parenlev > 0 else Token.NEWLINE
-    elif match.lastgroup == "Special":
+    elif kind == "Special":
         if token[-1] in "([{":
             state.parenlev += 1
         elif token in ")]}":
@@ -499,9 +560,9 @@ def next_psuedo_matches(state: TokenizerState) -> TokenInfo | None:
                 state.pop_mode((state.lnum, end))
             state.parenlev -= 1
         elif token == ":" and state.in_braces() and state.at_parenlev():
-            state.add_prog(start + 1, end, mode=ModeInColon(state.parenlev), pattern=choice(RBrace=EndRBrace))
+            state.add_prog(start + 1, end, mode=ModeInColon(state.parenlev), pattern=colon_prog)
         token_type = Token.OP
-    elif match.lastgroup == "End":  # // continuation
+    elif kind == "End":  # // continuation
         state.continued = True
         return None
     else:
@@ -535,38 +596,22 @@ def handle_fstring_progs(state: TokenizerState, endprog: EndProg) -> Iterator[To
     start, end = endmatch.span(endmatch.lastgroup)
     if endmatch.lastgroup == "End":  # quote match
         middle_end = end - len(endprog.quote)
-        if (middle_end > state.pos) or endprog.text:
+        if (middle_end > state.pos) or endprog.text_parts:
             yield state.prog_token(middle_end, Token.FSTRING_MIDDLE)
         yield TokenInfo(
-            Token.FSTRING_END,
-            endprog.quote,
-            start=(state.lnum, state.pos),
-            end=(state.lnum, end),
-            line=state.line,
+            Token.FSTRING_END, endprog.quote, state.position(state.pos), state.position(end), state.line
         )
         state.pop_mode()
     else:  # "{" or "}"
         middle_end = end - 1
-        if (middle_end > state.pos) or (endprog.text):  # has buffer
+        if (middle_end > state.pos) or endprog.text_parts:  # has buffer
             yield state.prog_token(middle_end, Token.FSTRING_MIDDLE)
         if endmatch.lastgroup == "LBrace":
-            yield TokenInfo(
-                Token.OP,
-                "{",
-                start=(state.lnum, state.pos),
-                end=(state.lnum, end),
-                line=state.line,
-            )
+            yield TokenInfo(Token.OP, "{", state.position(state.pos), state.position(end), state.line)
             state.parenlev += 1
             state.add_prog(end, end, mode=ModeInBraces(state.parenlev))
         else:  # rbrace
-            yield TokenInfo(
-                Token.OP,
-                "}",
-                start=(state.lnum, state.pos),
-                end=(state.lnum, end),
-                line=state.line,
-            )
+            yield TokenInfo(Token.OP, "}", state.position(state.pos), state.position(end), state.line)
             state.parenlev -= 1
             state.pop_mode()  # in-colon
             state.pop_mode((state.lnum, end))  # in braces
@@ -575,8 +620,7 @@ def handle_fstring_progs(state: TokenizerState, endprog: EndProg) -> Iterator[To
 
 
 def handle_end_progs(state: TokenizerState) -> Iterator[TokenInfo]:
-    if not state.end_progs:
-        return
+    """called only while inside a string, i.e. with state.end_progs set"""
     if state.pos == 0 and not state.line:
         raise TokenError("EOF in multi-line string", state.end_progs[-1].start)
 
@@ -588,7 +632,11 @@ def handle_end_progs(state: TokenizerState) -> Iterator[TokenInfo]:
         # else:
         #     raise TokenError(f"Expected {endprog.quote} inside f-string", (state.lnum, state.pos))
 
-    elif endmatch := state.match(state.end_progs[-1].pattern):  # all on one line
+    elif (
+        # lines without the closing quote (most lines of a docstring) cannot end the string
+        state.line.find((endprog := state.end_progs[-1]).quote, state.pos) != -1
+        and (endmatch := state.match(endprog.pattern))
+    ):  # all on one line
         end = endmatch.end(0)
         yield state.prog_token(end, Token.STRING)
         state.pop_mode()
@@ -631,7 +679,8 @@ def _tokenize(readline: Callable[[], str]) -> Iterator[TokenInfo]:
 
         pos = state.pos
         while state.pos < state.max:
-            yield from handle_end_progs(state)
+            if state.end_progs:
+                yield from handle_end_progs(state)
             if token := next_psuedo_matches(state):
                 yield token
             elif pos == state.pos:
@@ -5,10 +5,15 @@ from typing import TYPE_CHECKING, Final, NewType
 from .tokenize import Token, TokenInfo
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterator, Sequence
 
 Mark = NewType("Mark", int)
 
+# token types that are skipped by the parser
+BLANK_TOKENS: Final = frozenset((Token.NL, Token.COMMENT, Token.WS))
+# token types that are not considered while reporting errors
+WHITESPACE_TOKENS: Final = frozenset((Token.ENDMARKER, Token.NEWLINE, Token.DEDENT, Token.INDENT))
+
 
 class Tokenizer:
     """Caching wrapper for the tokenize module"""
@@ -65,7 +70,7 @@ class Tokenizer:
     def is_blank(self, tok: TokenInfo) -> bool:
         if self._proc_macro and tok.type == Token.WS:
             return False
-        if tok.type in {Token.NL, Token.COMMENT, Token.WS}:
+        if tok.type in BLANK_TOKENS:
             return True
         if tok.type == Token.ERRORTOKEN and tok.string.isspace():
             return True
@@ -166,12 +171,12 @@ class Tokenizer:
         idx = self._index - 1
         while idx >= 0:
             tok = self._tokens[idx]
-            if tok.type not in {Token.ENDMARKER, Token.NEWLINE, Token.DEDENT, Token.INDENT}:
+            if tok.type not in WHITESPACE_TOKENS:
                 return tok
             idx -= 1
         return self._tokens[-1]
 
-    def get_lines(self, line_numbers: list[int]) -> list[str]:
+    def get_lines(self, line_numbers: Sequence[int]) -> list[str]:
         """Retrieve source lines corresponding to line numbers."""
         if self._lines:
             lines = self._lines
@@ -1,29 +1,26 @@
 from __future__ import annotations
 
+import linecache
 import time
+import tracemalloc
 from contextlib import contextmanager
 from pathlib import Path
 
 
 def get_timestamp():
-    from datetime import datetime
+    return time.strftime("%Y-%m-%d-%H-%M-%S")
 
-    now = datetime.now()
 
-    return f"{now:%Y-%m-%d-%H-%M-%S}"
+# allocations that are not interesting for the report
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
 
 
 def display_top(snapshot, key_type="lineno", limit=10):
-    import linecache
-    import tracemalloc
-
     # todo: display all values greater than 5KiB instead of top 10/50
-    snapshot = snapshot.filter_traces(
-        (
-            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
-            tracemalloc.Filter(False, "<unknown>"),
-        )
-    )
+    snapshot = snapshot.filter_traces(SNAPSHOT_FILTERS)
     top_stats = snapshot.statistics(key_type)
 
     print(f"Top {limit} lines. {key_type=}")
@@ -59,11 +56,12 @@ def get_file(name: str, out_path: Path | None = None, ts: str | None = None):
 
 
 @contextmanager
-def trace(limit=10, show_tb=False):
-    """trace memory and time"""
-    import tracemalloc
+def trace(limit=10, show_tb=False, frames: int | None = None):
+    """trace memory and time
 
-    tracemalloc.start(25)
+    Only the innermost frame is recorded per allocation unless the tracebacks are shown.
+    """
+    tracemalloc.start(frames or (25 if show_tb else 1))
     yield
     snap = tracemalloc.take_snapshot()
 
@@ -1,5 +1,4 @@
 import ast
-import itertools
 from pathlib import Path
 from typing import IO, Any
 
@@ -8,6 +7,7 @@ from pegen import grammar
 from pegen.build import build_parser
 from pegen.grammar import (
     Alt,
+    Cut,
     Gather,
     Item,
     NamedItem,
@@ -29,6 +29,11 @@ from pegen.python_generator import (
     UsedNamesVisitor,
 )
 
+# the parser moves over the tokens by reading/writing the tokenizer position directly,
+# avoiding the method calls to Parser._mark/_reset in the generated rules.
+# Backtracking thus skips Tokenizer.reset, so verbose parsing no longer reports it.
+MARK = "self._tokenizer._index"
+
 
 class XonshCallMakerVisitor(PythonCallMakerVisitor):
     def __init__(self, parser_generator: "XonshParserGenerator"):
@@ -60,43 +65,12 @@ class XonshCallMakerVisitor(PythonCallMakerVisitor):
             return "_" + name.lower(), f"self.token('{token.name}')"
         return name, f"self.{name}()"
 
-    def rhs_helper(self, node: Rhs) -> tuple[str, str] | None:
-        # special case to reduce generated code size
-        if (
-            len(node.alts) <= 1
-            or (any(a.action for a in node.alts))
-            or (any(len(a.items) > 1 for a in node.alts))
-        ):
-            return None
-        alt_funcs = itertools.chain.from_iterable(a.items for a in node.alts)
-        args = []
-        for fn in alt_funcs:
-            head, tail = self.lookahead_call_helper(fn, nested=False)
-            if tail:
-                args.append(f"({head}, {tail})")  # tuple
-            else:
-                args.append(head)  # func
-        return "seq_alts", f"self.seq_alts({', '.join(args)},)"
-
-    # def visit_Rhs(self, node: Rhs) -> tuple[str | None, str]:
-    #     if node in self.cache:
-    #         return self.cache[node]
-    #     if len(node.alts) == 1 and len(node.alts[0].items) == 1:
-    #         self.cache[node] = self.visit(node.alts[0].items[0])
-    #     elif simple := self.rhs_helper(node):
-    #         name, call = simple
-    #         self.cache[node] = name, call
-    #     else:
-    #         name = self.gen.artifical_rule_from_rhs(node)
-    #         self.cache[node] = name, f"self.{name}()"
-    #     return self.cache[node]
-
     def visit_Gather(self, node: Gather) -> tuple[str, str]:
         if node in self.cache:
             return self.cache[node]
         func, fn_args = self.lookahead_call_helper(node)
-        if fn_args:
-            func = f"({func}, {fn_args})"
+        if fn_args:  # gathered calls the element without arguments
+            func = f"lambda: {func}({fn_args})"
         sep = ", ".join(self._call_helper(node.separator, nested=False))
         self.cache[node] = "gathered", f"self.gathered({func}, {sep})"  # No trailing comma here either!
         return self.cache[node]
@@ -150,6 +124,8 @@ class XonshParserGenerator(PythonParserGenerator):
         self.unreachable_formatting = unreachable_formatting or "None  # pragma: no cover"
         self.location_formatting = "**self.span(_lnum, _col)"
         self.cleanup_statements: list[str] = []
+        # set while generating a memoized rule, whose cache lookup/store is inlined
+        self.memoized_rule = False
 
     def artifical_rule_from_rhs(self, rhs: Rhs) -> str:
         self.counter += 1
@@ -180,8 +156,10 @@ class XonshParserGenerator(PythonParserGenerator):
 
         self.print()
         with self.indent():
-            self.print(f"KEYWORDS = {tuple(sorted(self.callmakervisitor.keywords))} # fmt: skip")
-            self.print(f"SOFT_KEYWORDS = {tuple(sorted(self.callmakervisitor.soft_keywords))} # fmt: skip")
+            self.print(f"KEYWORDS = frozenset({tuple(sorted(self.callmakervisitor.keywords))}) # fmt: skip")
+            self.print(
+                f"SOFT_KEYWORDS = frozenset({tuple(sorted(self.callmakervisitor.soft_keywords))}) # fmt: skip"
+            )
 
         trailer = self.grammar.metas.get("trailer", MODULE_SUFFIX.format(class_name=cls_name))
         if trailer is not None:
@@ -192,13 +170,26 @@ class XonshParserGenerator(PythonParserGenerator):
             self.print(stmt)
         # terse representation of return values
         ret_val = ast.unparse(ast.parse(ret_val))
+        if self.memoized_rule:
+            if not (ret_val.isidentifier() or ret_val == "None"):
+                self.print(f"_tree = {ret_val}")
+                ret_val = "_tree"
+            self.print(f"_cache[_key] = {ret_val}, {MARK}")
         self.print(f"return {ret_val}")
 
-    def visit_Rule(self, node: Rule) -> None:
-        is_loop = node.is_loop()
-        is_gather = node.is_gather()
-        rhs = node.flatten()
-        method_args = ""
+    def print_memo_lookup(self, node: Rule) -> None:
+        """inline the packrat cache lookup, verbose parsing traces it with `subheader.trace_memoized`"""
+        self.print(f"_key = mark * self._nrules + self._{node.name}_id")
+        self.print("_cache = self._cache")
+        self.print("if _key >= len(_cache):")
+        with self.indent():
+            self.print("_cache.extend([None] * (_key + 1))")
+        self.print("elif (_hit := _cache[_key]) is not None:")
+        with self.indent():
+            self.print(f"{MARK} = _hit[1]")
+            self.print("return _hit[0]")
+
+    def print_decorator(self, node: Rule) -> None:
         if node.left_recursive:
             if node.leader:
                 self.print("@memoize_left_rec")
@@ -207,8 +198,16 @@ class XonshParserGenerator(PythonParserGenerator):
                 # but they must still be logged.
                 self.print("@logger")
         elif node.memo:
-            self.print("@memoize")
-            # method_args = ", mark: Mark"
+            # the cache lookup is inlined into the rule body, see print_memo_lookup
+            self.print(f'_{node.name}_id = rule_id("{node.name}")')
+            self.memoized_rule = True
+
+    def visit_Rule(self, node: Rule) -> None:
+        is_loop = node.is_loop()
+        is_gather = node.is_gather()
+        rhs = node.flatten()
+        method_args = ""
+        self.print_decorator(node)
         node_type = node.type or "Any"
         self.print(f"def {node.name}(self{method_args}) -> {node_type} | None:")
         with self.indent():
@@ -221,13 +220,9 @@ class XonshParserGenerator(PythonParserGenerator):
                 self.print("self.call_invalid_rules = False")
                 self.cleanup_statements.append("self.call_invalid_rules = _prev_call_invalid")
 
-            # special case to reduce generated code size
-            if simple := self.callmakervisitor.rhs_helper(node.rhs):
-                _, call = simple
-                self.print(f"return {call}")
-                return
-
-            self.print("mark = self._mark()")
+            self.print(f"mark = {MARK}")
+            if self.memoized_rule:
+                self.print_memo_lookup(node)
             if self.alts_uses_locations(node.rhs.alts):
                 self.print("_lnum, _col = self._tokenizer.peek().start")
             if is_loop:
@@ -240,6 +235,7 @@ class XonshParserGenerator(PythonParserGenerator):
 
         if node.name.endswith("without_invalid"):
             self.cleanup_statements.pop()
+        self.memoized_rule = False
 
     def print_action(
         self,
@@ -264,10 +260,65 @@ class XonshParserGenerator(PythonParserGenerator):
 
         if is_loop:
             self.print(f"children.append({action})")
-            self.print("mark = self._mark()")
+            self.print(f"mark = {MARK}")
         else:
             self.add_return(f"{action}")
 
+    def visit_Alt(self, node: Alt, is_loop: bool, is_gather: bool) -> None:
+        has_cut = any(isinstance(item.item, Cut) for item in node.items)
+        has_invalid = self.invalidvisitor.visit(node)
+
+        action = node.action
+        if not action and not is_gather and has_invalid:
+            action = "UNREACHABLE"
+
+        locations = False
+        unreachable = False
+        used = None
+        if action:
+            # Replace magic name in the action rule
+            if "LOCATIONS" in action:
+                locations = True
+                action = action.replace("LOCATIONS", self.location_formatting)
+            if "UNREACHABLE" in action:
+                unreachable = True
+                action = action.replace("UNREACHABLE", self.unreachable_formatting)
+
+            # Extract the names actually used in the action.
+            used = self.usednamesvisitor.visit(ast.parse(action))
+            if has_cut:
+                used.add("cut")
+
+        with self.local_variable_context():
+            if has_cut:
+                self.print("cut = False")
+            self.print("while (" if is_loop else "if (")
+            with self.indent():
+                first = True
+                if has_invalid:
+                    self.print("self.call_invalid_rules")
+                    first = False
+                for item in node.items:
+                    if first:
+                        first = False
+                    else:
+                        self.print("and")
+                    self.visit(item, used=used, unreachable=unreachable)
+                    if is_gather:
+                        self.print("is not None")
+
+            self.print("):")
+            with self.indent():
+                self.print_action(action, locations, unreachable, is_gather, is_loop, has_invalid)
+
+            # backtrack by moving the tokenizer position, not through self._reset(mark)
+            self.print(f"{MARK} = mark")
+            # Skip remaining alternatives if a cut was reached.
+            if has_cut:
+                self.print("if cut:")
+                with self.indent():
+                    self.add_return("None")
+
     def print(self, *args: object) -> None:
         super().print(*args)
         self.file.flush()
@@ -0,0 +1,74 @@
+"""Report how often each grammar rule is re-tried at the same token position.
+
+Memoization is opt-in: only rules marked with ``(memo)`` in ``xonsh.gram`` get a packrat
+cache slot. Caching pays off only for rules that are re-tried at the same position
+(i.e. backtracking), otherwise it is just extra bookkeeping. The rules whose re-try
+rate is above the threshold are good candidates for ``(memo)``.
+
+    python tasks/memo_stats.py [file] [--threshold 0.2]
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+from argparse import ArgumentParser
+from collections import Counter
+from pathlib import Path
+
+from peg_parser.parser import XonshParser
+
+
+def count_rule_calls(path: Path) -> tuple[Counter[str], Counter[str]]:
+    """Parse the file and return the total and repeated call counts per rule"""
+    calls: Counter[str] = Counter()
+    repeats: Counter[str] = Counter()
+    seen: set[tuple[int, str]] = set()
+
+    def wrap(name, method):
+        @functools.wraps(method)
+        def wrapper(self):
+            key = (self._mark(), name)
+            calls[name] += 1
+            if key in seen:
+                repeats[name] += 1
+            else:
+                seen.add(key)
+            return method(self)
+
+        return wrapper
+
+    rules = {
+        name: wrap(name, method)
+        for name, method in vars(XonshParser).items()
+        if inspect.isfunction(method) and len(inspect.signature(method).parameters) == 1
+    }
+    counting_parser = type("CountingParser", (XonshParser,), rules)
+    counting_parser.parse_file(path)
+    return calls, repeats
+
+
+def main(path: Path, threshold: float) -> None:
+    calls, repeats = count_rule_calls(path)
+    memoized = {
+        name
+        for name, method in vars(XonshParser).items()
+        if f"_{name}_id" in vars(XonshParser) or getattr(method, "__name__", "") == "memoize_left_rec_wrapper"
+    }
+    print(f"{'rule':40} {'calls':>10} {'repeats':>10} {'rate':>6}  memo")
+    for name, total in calls.most_common():
+        rate = repeats[name] / total
+        if rate < threshold:
+            continue
+        memo = "yes" if name in memoized else ""
+        print(f"{name:40} {total:10} {repeats[name]:10} {rate:6.1%}  {memo}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument(
+        "file", type=Path, nargs="?", default=Path(__file__).parent.parent / "peg_parser" / "parser.py"
+    )
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+    main(args.file, args.threshold)
@@ -46,7 +46,7 @@ def _get_tokens(inp):
     from peg_parser import tokenize
     from peg_parser.tokenizer import Tokenizer
 
-    gen = tokenize.generate_tokens(io.StringIO(inp).readline)
+    gen = tokenize.generate_tokens(inp)
     tokenizer = Tokenizer(gen)
     tokens = []
     while True:
@@ -36,3 +36,6 @@ __xonsh__.path_literal(f'/foo{1 + 1}')
 
 # Fp"/foo{1+1}"
 __xonsh__.path_literal(f'/foo{1 + 1}')
+
+# p"/it's"
+__xonsh__.path_literal("/it's")
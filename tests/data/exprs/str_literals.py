@@ -17,3 +17,9 @@ f'Simple stringmore'
 # \
 # some more"
 'more line some more'
+
+# "help's"
+"help's"
+
+# "it's a p" 'p'
+"it's a pp"
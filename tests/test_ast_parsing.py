@@ -22,6 +22,8 @@ def dump_diff(**trees: ast.AST):
     original, pp_ast = trees.values()
     o = ast.dump(original, **kwargs)
     p = ast.dump(pp_ast, **kwargs)
+    if o == p:
+        return ""
     return "\n".join(difflib.unified_diff(o.split("\n"), p.split("\n"), orig_name, pp_name))
 
 
@@ -97,3 +99,16 @@ def test_pure_python_parsing(python_parse_file, parse_str, filename):
 )
 def test_ast_strings(inp, unparse_diff):
     unparse_diff(inp)
+
+
+@pytest.mark.parametrize(
+    "inp",
+    [
+        '"a" "b"',
+        'u"a" "b"',
+        '"a"\\\n  "b" "c"',
+    ],
+)
+def test_implicit_string_concat(inp, parse_str):
+    diff = dump_diff(cpython=ast.parse(inp, mode="eval"), pegen=parse_str(inp))
+    assert not diff
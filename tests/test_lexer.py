@@ -1,30 +1,29 @@
 """Tests the xonsh lexer."""
 
 import difflib
-from collections.abc import Sequence
 
 import pytest
 
 from peg_parser.tokenize import Token as t  # noqa: N813
-from peg_parser.tokenize import TokenInfo
+from peg_parser.tokenize import TokenInfo, first_char_progs, pseudoprog
 
 
-def ensure_tuple(seq) -> str:
+def ensure_tuple(seq) -> tuple:
     if isinstance(seq, TokenInfo):
-        seq = (seq.type.name, seq.string, seq.start[1])
-    if isinstance(seq, Sequence):
-        typ, *rest = seq
-        seq = (typ.name if isinstance(typ, t) else t[typ].name, *rest)
-    return repr(tuple(seq))
+        return seq.type.name, seq.string, seq.start[1]
+    typ, *rest = seq
+    return (typ.name, *rest)
 
 
 def assert_tokens_equal(expected, obtained):
     """Asserts that two token sequences are equal."""
     left = [ensure_tuple(item) for item in expected]
     right = [ensure_tuple(item) for item in obtained]
-    if diff := "\n".join(difflib.unified_diff(left, right, "expected", "obtained")):
-        print("\n".join(difflib.ndiff(left, right)))
-    return not diff
+    if left == right:
+        return True
+    # only render the tokens to show the differences
+    print("\n".join(difflib.ndiff(list(map(repr, left)), list(map(repr, right)))))
+    return False
 
 
 def lex_input(inp: str) -> list[TokenInfo]:
@@ -67,44 +66,59 @@ def test_literals(inp, exp):
 
 
 def test_indent():
-    exp = [("INDENT", "  \t  ", 0), ("NUMBER", "42", 5), ("NEWLINE", "", 7), ("DEDENT", "", 0)]
+    exp = [(t.INDENT, "  \t  ", 0), (t.NUMBER, "42", 5), (t.NEWLINE, "", 7), (t.DEDENT, "", 0)]
     assert check_tokens("  \t  42", *exp)
 
 
 def test_post_whitespace():
     inp = "42  \t  "
-    exp = ("NUMBER", "42", 0)
+    exp = (t.NUMBER, "42", 0)
     assert check_tokens(inp, exp)
 
 
 def test_internal_whitespace():
     inp = "42  +\t65"
-    exp = [("NUMBER", "42", 0), ("OP", "+", 4), ("NUMBER", "65", 6)]
+    exp = [(t.NUMBER, "42", 0), (t.OP, "+", 4), (t.NUMBER, "65", 6)]
     assert check_tokens(inp, *exp)
 
 
+def test_repeated_names_share_strings():
+    first, op, second, *_ = lex_input("spam == spam")
+    assert first.string is second.string
+    assert op.string is lex_input("x == y")[1].string
+
+
+@pytest.mark.parametrize(
+    "inp", ["x = 1", "# c", "'s'", "0x1f", "\\\n", "`a.*`", "\t\n", "$HOME", "a->b", "yield"]
+)
+def test_first_char_dispatch(inp):
+    match = first_char_progs[inp[0]].match(inp)
+    expected = pseudoprog.match(inp)
+    assert (match.lastgroup, match.group()) == (expected.lastgroup, expected.group(expected.lastgroup))
+
+
 def test_indent_internal_whitespace():
     inp = " 42  +\t65"
     exp = [
-        ("INDENT", " ", 0),
-        ("NUMBER", "42", 1),
-        ("OP", "+", 5),
-        ("NUMBER", "65", 7),
-        ("NEWLINE", "", 9),
-        ("DEDENT", "", 0),
+        (t.INDENT, " ", 0),
+        (t.NUMBER, "42", 1),
+        (t.OP, "+", 5),
+        (t.NUMBER, "65", 7),
+        (t.NEWLINE, "", 9),
+        (t.DEDENT, "", 0),
     ]
     assert check_tokens(inp, *exp)
 
 
 def test_assignment():
     inp = "x = 42"
-    exp = [("NAME", "x", 0), ("OP", "=", 2), ("NUMBER", "42", 4)]
+    exp = [(t.NAME, "x", 0), (t.OP, "=", 2), (t.NUMBER, "42", 4)]
     assert check_tokens(inp, *exp)
 
 
 def test_multiline():
     inp = "x\ny"
-    exp = [("NAME", "x", 0), ("NEWLINE", "\n", 1), ("NAME", "y", 0)]
+    exp = [(t.NAME, "x", 0), (t.NEWLINE, "\n", 1), (t.NAME, "y", 0)]
     assert check_tokens(inp, *exp)
 
 
@@ -123,9 +137,9 @@ def test_atdollar_expression():
     inp = "@$(which python)"
     exp = [
         (t.OP, "@$(", 0),
-        ("NAME", "which", 3),
-        ("NAME", "python", 9),
-        ("OP", ")", 15),
+        (t.NAME, "which", 3),
+        (t.NAME, "python", 9),
+        (t.OP, ")", 15),
     ]
     assert check_tokens(inp, *exp)
 
@@ -134,7 +148,7 @@ def test_and():
     # no preceding whitespace or other tokens, so this
     # resolves to NAME, since it doesn't make sense for
     # Python code to start with "and"
-    assert check_tokens("and", ["NAME", "and", 0])
+    assert check_tokens("and", [t.NAME, "and", 0])
 
 
 def test_ampersand():
@@ -144,11 +158,11 @@ def test_ampersand():
 def test_not_really_and_pre():
     inp = "![foo-and]"
     exp = [
-        ("OP", "![", 0),
-        ("NAME", "foo", 2),
-        ("OP", "-", 5),
-        ("NAME", "and", 6),
-        ("OP", "]", 9),
+        (t.OP, "![", 0),
+        (t.NAME, "foo", 2),
+        (t.OP, "-", 5),
+        (t.NAME, "and", 6),
+        (t.OP, "]", 9),
     ]
     assert check_tokens(inp, *exp)
 
@@ -156,11 +170,11 @@ def test_not_really_and_pre():
 def test_not_really_and_post():
     inp = "![and-bar]"
     exp = [
-        ("OP", "![", 0),
-        ("NAME", "and", 2),
-        ("OP", "-", 5),
-        ("NAME", "bar", 6),
-        ("OP", "]", 9),
+        (t.OP, "![", 0),
+        (t.NAME, "and", 2),
+        (t.OP, "-", 5),
+        (t.NAME, "bar", 6),
+        (t.OP, "]", 9),
     ]
     assert check_tokens(inp, *exp)
 
@@ -168,13 +182,13 @@ def test_not_really_and_post():
 def test_not_really_and_pre_post():
     inp = "![foo-and-bar]"
     exp = [
-        ("OP", "![", 0),
-        ("NAME", "foo", 2),
+        (t.OP, "![", 0),
+        (t.NAME, "foo", 2),
         (t.OP, "-", 5),
-        ("NAME", "and", 6),
+        (t.NAME, "and", 6),
         (t.OP, "-", 9),
-        ("NAME", "bar", 10),
-        ("OP", "]", 13),
+        (t.NAME, "bar", 10),
+        (t.OP, "]", 13),
     ]
     assert check_tokens(inp, *exp)
 
@@ -182,11 +196,11 @@ def test_not_really_and_pre_post():
 def test_not_really_or_pre():
     inp = "![foo-or]"
     exp = [
-        ("OP", "![", 0),
-        ("NAME", "foo", 2),
+        (t.OP, "![", 0),
+        (t.NAME, "foo", 2),
         (t.OP, "-", 5),
-        ("NAME", "or", 6),
-        ("OP", "]", 8),
+        (t.NAME, "or", 6),
+        (t.OP, "]", 8),
     ]
     assert check_tokens(inp, *exp)
 
@@ -194,11 +208,11 @@ def test_not_really_or_pre():
 def test_not_really_or_post():
     inp = "![or-bar]"
     exp = [
-        ("OP", "![", 0),
-        ("NAME", "or", 2),
+        (t.OP, "![", 0),
+        (t.NAME, "or", 2),
         (t.OP, "-", 4),
-        ("NAME", "bar", 5),
-        ("OP", "]", 8),
+        (t.NAME, "bar", 5),
+        (t.OP, "]", 8),
     ]
     assert check_tokens(inp, *exp)
 
@@ -206,13 +220,13 @@ def test_not_really_or_post():
 def test_not_really_or_pre_post():
     inp = "![foo-or-bar]"
     exp = [
-        ("OP", "![", 0),
-        ("NAME", "foo", 2),
+        (t.OP, "![", 0),
+        (t.NAME, "foo", 2),
         (t.OP, "-", 5),
-        ("NAME", "or", 6),
+        (t.NAME, "or", 6),
         (t.OP, "-", 8),
-        ("NAME", "bar", 9),
-        ("OP", "]", 12),
+        (t.NAME, "bar", 9),
+        (t.OP, "]", 12),
     ]
     assert check_tokens(inp, *exp)
 
@@ -220,21 +234,21 @@ def test_not_really_or_pre_post():
 def test_subproc_line_cont_space():
     inp = "![echo --option1 value1 \\\n" "     --option2 value2 \\\n" "     --optionZ valueZ]"
     exp = [
-        ("OP", "![", 0),
-        ("NAME", "echo", 2),
+        (t.OP, "![", 0),
+        (t.NAME, "echo", 2),
         (t.OP, "-", 7),
         (t.OP, "-", 8),
-        ("NAME", "option1", 9),
-        ("NAME", "value1", 17),
+        (t.NAME, "option1", 9),
+        (t.NAME, "value1", 17),
         (t.OP, "-", 5),
         (t.OP, "-", 6),
-        ("NAME", "option2", 7),
-        ("NAME", "value2", 15),
+        (t.NAME, "option2", 7),
+        (t.NAME, "value2", 15),
         (t.OP, "-", 5),
         (t.OP, "-", 6),
-        ("NAME", "optionZ", 7),
-        ("NAME", "valueZ", 15),
-        ("OP", "]", 21),
+        (t.NAME, "optionZ", 7),
+        (t.NAME, "valueZ", 15),
+        (t.OP, "]", 21),
     ]
     assert check_tokens(inp, *exp)
 
@@ -242,27 +256,27 @@ def test_subproc_line_cont_space():
 def test_subproc_line_cont_nospace():
     inp = "![echo --option1 value1\\\n" "     --option2 value2\\\n" "     --optionZ valueZ]"
     exp = [
-        ("OP", "![", 0),
-        ("NAME", "echo", 2),
+        (t.OP, "![", 0),
+        (t.NAME, "echo", 2),
         (t.OP, "-", 7),
         (t.OP, "-", 8),
-        ("NAME", "option1", 9),
-        ("NAME", "value1", 17),
+        (t.NAME, "option1", 9),
+        (t.NAME, "value1", 17),
         (t.OP, "-", 5),
         (t.OP, "-", 6),
-        ("NAME", "option2", 7),
-        ("NAME", "value2", 15),
+        (t.NAME, "option2", 7),
+        (t.NAME, "value2", 15),
         (t.OP, "-", 5),
         (t.OP, "-", 6),
-        ("NAME", "optionZ", 7),
-        ("NAME", "valueZ", 15),
-        ("OP", "]", 21),
+        (t.NAME, "optionZ", 7),
+        (t.NAME, "valueZ", 15),
+        (t.OP, "]", 21),
     ]
     assert check_tokens(inp, *exp)
 
 
 def test_doubleamp():
-    assert check_tokens("&&", ["OP", "&&", 0])
+    assert check_tokens("&&", [t.OP, "&&", 0])
 
 
 def test_pipe():
@@ -270,64 +284,68 @@ def test_pipe():
 
 
 def test_doublepipe():
-    assert check_tokens("||", ["OP", "||", 0])
+    assert check_tokens("||", [t.OP, "||", 0])
 
 
 def test_single_quote_literal():
-    assert check_tokens("'yo'", ["STRING", "'yo'", 0])
+    assert check_tokens("'yo'", [t.STRING, "'yo'", 0])
 
 
 def test_double_quote_literal():
-    assert check_tokens('"yo"', ["STRING", '"yo"', 0])
+    assert check_tokens('"yo"', [t.STRING, '"yo"', 0])
 
 
 def test_triple_single_quote_literal():
-    assert check_tokens("'''yo'''", ["STRING", "'''yo'''", 0])
+    assert check_tokens("'''yo'''", [t.STRING, "'''yo'''", 0])
 
 
 def test_triple_double_quote_literal():
-    assert check_tokens('"""yo"""', ["STRING", '"""yo"""', 0])
+    assert check_tokens('"""yo"""', [t.STRING, '"""yo"""', 0])
 
 
 def test_single_raw_string_literal():
-    assert check_tokens("r'yo'", ["STRING", "r'yo'", 0])
+    assert check_tokens("r'yo'", [t.STRING, "r'yo'", 0])
 
 
 def test_double_raw_string_literal():
-    assert check_tokens('r"yo"', ["STRING", 'r"yo"', 0])
+    assert check_tokens('r"yo"', [t.STRING, 'r"yo"', 0])
 
 
 @pytest.mark.parametrize("quote", ["'", '"'])
 def test_single_f_string_literal(quote):
     assert check_tokens(
         f"f{quote}{{yo}}{quote}",
-        ("FSTRING_START", f"f{quote}", 0),
-        ("OP", "{", 2),
-        ("NAME", "yo", 3),
-        ("OP", "}", 5),
-        ("FSTRING_END", f"{quote}", 6),
+        (t.FSTRING_START, f"f{quote}", 0),
+        (t.OP, "{", 2),
+        (t.NAME, "yo", 3),
+        (t.OP, "}", 5),
+        (t.FSTRING_END, f"{quote}", 6),
     )
 
 
 def test_single_unicode_literal():
-    assert check_tokens("u'yo'", ["STRING", "u'yo'", 0])
+    assert check_tokens("u'yo'", [t.STRING, "u'yo'", 0])
 
 
 def test_double_unicode_literal():
-    assert check_tokens('u"yo"', ["STRING", 'u"yo"', 0])
+    assert check_tokens('u"yo"', [t.STRING, 'u"yo"', 0])
 
 
 def test_single_bytes_literal():
-    assert check_tokens("b'yo'", ["STRING", "b'yo'", 0])
+    assert check_tokens("b'yo'", [t.STRING, "b'yo'", 0])
 
 
-def test_path_string_literal():
-    assert check_tokens("p'/foo'", ["STRING", "p'/foo'", 0])
-    assert check_tokens('p"/foo"', ["STRING", 'p"/foo"', 0])
-    assert check_tokens("pr'/foo'", ["STRING", "pr'/foo'", 0])
-    assert check_tokens('pr"/foo"', ["STRING", 'pr"/foo"', 0])
-    assert check_tokens("rp'/foo'", ["STRING", "rp'/foo'", 0])
-    assert check_tokens('rp"/foo"', ["STRING", 'rp"/foo"', 0])
+@pytest.mark.parametrize("pre", ["b", "B", "rb", "bR", "Rb", "u", "U", "R", "PR", "rP"])
+def test_string_prefixes(pre):
+    inp = f"{pre}'yo'"
+    assert check_tokens(inp, [t.STRING, inp, 0])
+
+
+@pytest.mark.parametrize("quote", ["'", '"'])
+@pytest.mark.parametrize("pre", ["p", "pr", "rp", "P", "Pr", "rP", "PR"])
+def test_path_string_literal(pre, quote):
+    inp = f"{pre}{quote}/foo{quote}"
+    assert check_tokens(inp, [t.STRING, inp, 0])
 
 
 @pytest.mark.parametrize("quote", ["'", '"'])
@@ -335,9 +353,9 @@ def test_path_string_literal():
 def test_path_fstring_literal(pre, quote):
     assert check_tokens(
         f"{pre}{quote}/foo{quote}",
-        ["FSTRING_START", f"{pre}{quote}", 0],
-        ["FSTRING_MIDDLE", "/foo", 3],
-        ["FSTRING_END", f"{quote}", 7],
+        [t.FSTRING_START, f"{pre}{quote}", 0],
+        [t.FSTRING_MIDDLE, "/foo", 3],
+        [t.FSTRING_END, f"{quote}", 7],
     )
 
 
@@ -345,31 +363,18 @@ def test_regex_globs():
     for i in (".*", r"\d*", ".*#{1,2}"):
         for p in ("", "r", "g", "@somethingelse", "p", "pg"):
             c = f"{p}`{i}`"
-            assert check_tokens(c, ["SEARCH_PATH", c, 0])
+            assert check_tokens(c, [t.SEARCH_PATH, c, 0])
 
 
-@pytest.mark.parametrize(
-    "case",
-    [
-        "0.0",
-        ".0",
-        "0.",
-        "1e10",
-        "1.e42",
-        "0.1e42",
-        "0.5e-42",
-        "5E10",
-        "5e+42",
-        "1_0e1_0",
-    ],
-)
-def test_float_literals(case):
-    assert check_tokens(case, ["NUMBER", case, 0])
+def test_float_literals(subtests):
+    for case in ("0.0", ".0", "0.", "1e10", "1.e42", "0.1e42", "0.5e-42", "5E10", "5e+42", "1_0e1_0"):
+        with subtests.test(name=case):
+            assert check_tokens(case, [t.NUMBER, case, 0])
 
 
 @pytest.mark.parametrize("case", ["o>", "all>", "e>", "out>"])
 def test_ioredir1(case):
-    assert check_tokens_subproc(case, [("NAME", case[:-1], 2), (t.OP, case[-1], len(case) + 1)])
+    assert check_tokens_subproc(case, [(t.NAME, case[:-1], 2), (t.OP, case[-1], len(case) + 1)])
 
 
 @pytest.mark.parametrize("case", ["2>1", "err>out", "e>o"])
@@ -378,9 +383,9 @@ def test_ioredir2(case):
     assert check_tokens_subproc(
         case,
         [
-            ("NUMBER" if case[:idx].isdigit() else t.NAME, case[:idx], 0 + 2),
+            (t.NUMBER if case[:idx].isdigit() else t.NAME, case[:idx], 0 + 2),
             (t.OP, ">", idx + 2),
-            ("NUMBER" if case[idx + 1].isdigit() else t.NAME, case[idx + 1 :], idx + 3),
+            (t.NUMBER if case[idx + 1].isdigit() else t.NAME, case[idx + 1 :], idx + 3),
         ],
     )
 
@@ -388,29 +393,29 @@ def test_ioredir2(case):
 @pytest.mark.parametrize(
     "s, exp",
     [
-        ("2>1", [("NUMBER", "2", 0), (t.OP, ">", 1), ("NUMBER", "1", 2)]),
-        ("a>b", [("NAME", "a", 0), (t.OP, ">", 1), ("NAME", "b", 2)]),
+        ("2>1", [(t.NUMBER, "2", 0), (t.OP, ">", 1), (t.NUMBER, "1", 2)]),
+        ("a>b", [(t.NAME, "a", 0), (t.OP, ">", 1), (t.NAME, "b", 2)]),
         (
             "3>2>1",
             [
-                ("NUMBER", "3", 0),
+                (t.NUMBER, "3", 0),
                 (t.OP, ">", 1),
-                ("NUMBER", "2", 2),
+                (t.NUMBER, "2", 2),
                 (t.OP, ">", 3),
-                ("NUMBER", "1", 4),
+                (t.NUMBER, "1", 4),
             ],
         ),
         (
             "36+2>>3",
             [
-                ("NUMBER", "36", 0),
+                (t.NUMBER, "36", 0),
                 (t.OP, "+", 2),
-                ("NUMBER", "2", 3),
+                (t.NUMBER, "2", 3),
                 (t.OP, ">>", 4),
-                ("NUMBER", "3", 6),
+                (t.NUMBER, "3", 6),
             ],
         ),
-        ("2>&1", [("NUMBER", "2", 0), ("OP", ">&", 1), ("NUMBER", "1", 3)]),
+        ("2>&1", [(t.NUMBER, "2", 0), (t.OP, ">&", 1), (t.NUMBER, "1", 3)]),
     ],
 )
 def test_pymode_not_ioredirect(s, exp):
@@ -422,23 +427,23 @@ def test_pymode_not_ioredirect(s, exp):
 def test_fstring_nested_py312():
     assert check_tokens(
         "f'{a+b:.3f} more words {c+d=} final words'",
-        ("FSTRING_START", "f'", 0),
-        ("OP", "{", 2),
-        ("NAME", "a", 3),
-        ("OP", "+", 4),
-        ("NAME", "b", 5),
-        ("OP", ":", 6),
-        ("FSTRING_MIDDLE", ".3f", 7),
-        ("OP", "}", 10),
-        ("FSTRING_MIDDLE", " more words ", 11),
-        ("OP", "{", 23),
-        ("NAME", "c", 24),
-        ("OP", "+", 25),
-        ("NAME", "d", 26),
-        ("OP", "=", 27),
-        ("OP", "}", 28),
-        ("FSTRING_MIDDLE", " final words", 29),
-        ("FSTRING_END", "'", 41),
+        (t.FSTRING_START, "f'", 0),
+        (t.OP, "{", 2),
+        (t.NAME, "a", 3),
+        (t.OP, "+", 4),
+        (t.NAME, "b", 5),
+        (t.OP, ":", 6),
+        (t.FSTRING_MIDDLE, ".3f", 7),
+        (t.OP, "}", 10),
+        (t.FSTRING_MIDDLE, " more words ", 11),
+        (t.OP, "{", 23),
+        (t.NAME, "c", 24),
+        (t.OP, "+", 25),
+        (t.NAME, "d", 26),
+        (t.OP, "=", 27),
+        (t.OP, "}", 28),
+        (t.FSTRING_MIDDLE, " final words", 29),
+        (t.FSTRING_END, "'", 41),
     )
 
 
@@ -468,6 +473,6 @@ non-important content
         (t.OP, "(", 8),
         (t.OP, ")", 9),
         (t.OP, "}", 10),
-        ("FSTRING_MIDDLE", "\nnon-important content\n", 11),
+        (t.FSTRING_MIDDLE, "\nnon-important content\n", 11),
         (t.FSTRING_END, "'''", 0),
     )
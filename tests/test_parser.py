@@ -1,10 +1,15 @@
 """Tests the xonsh parser."""
 
+import ast
 import sys
 from pathlib import Path
 
 import pytest
 
+from peg_parser import subheader
+from peg_parser.tokenize import generate_tokens
+from peg_parser.tokenizer import Tokenizer
+
 
 @pytest.mark.parametrize(
     "inp",
@@ -255,6 +260,30 @@ def test_comment_only(check_xonsh_ast):
     check_xonsh_ast("# hello", mode="exec")
 
 
+def test_verbose_traces_memoized_rules(python_parse_str, capsys):
+    python_parse_str("x + 1", verbose=True)
+    out = capsys.readouterr().out
+    # disjunction has its cache lookup inlined by the generator
+    assert "disjunction() ... (looking at" in out
+    assert "... disjunction() -> " in out
+
+
+def test_verbose_traces_logged_rules(python_parse_str, capsys):
+    python_parse_str("match x:\n    case a.b(): pass\n", mode="exec", verbose=True)
+    out = capsys.readouterr().out
+    # name_or_attr is a non-leader left-recursive rule marked with @logger
+    assert "name_or_attr() .... (looking at" in out
+    assert "... name_or_attr() --> " in out
+
+
+def test_verbose_compiled_parser_keeps_class_rules(python_parser_cls, monkeypatch):
+    # the native classes of the mypyc build cannot take the tracing wrappers per instance
+    monkeypatch.setattr(subheader, "COMPILED", True)
+    parser = python_parser_cls(Tokenizer(generate_tokens("x + 1"), verbose=True), verbose=True)
+    assert "disjunction" not in vars(parser)
+    assert isinstance(parser.parse("eval"), ast.Expression)
+
+
 @pytest.mark.parametrize(
     "case",
     [
@@ -1428,3 +1428,15 @@ def test_syntax_error_in_type_params(
     parse_invalid_syntax(
         python_parse_file, python_parse_str, tmp_path, source, exception, message, start, end
     )
+
+
+def test_syntax_error_text_spanning_lines(python_parse_file, python_parse_str, tmp_path):
+    source = "(a 1 if b\n else 2)\n"
+    test_file = tmp_path / "test.py"
+    test_file.write_text(source)
+
+    for parse in (lambda: python_parse_str(source, "exec"), lambda: python_parse_file(test_file)):
+        with pytest.raises(SyntaxError) as e:
+            parse()
+        assert (e.value.lineno, e.value.end_lineno) == (1, 2)
+        assert e.value.text == source